@@ -7,6 +7,7 @@ from setuptools import find_packages, setup
 
 MAIN_REQUIREMENTS = [
     "airbyte-cdk",
+    "ijson~=3.2.3",
 ]
 
 TEST_REQUIREMENTS = [
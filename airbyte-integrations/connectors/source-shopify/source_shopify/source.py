@@ -4,20 +4,44 @@
 
 
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic, sleep
 from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
-from urllib.parse import parse_qsl, urlparse
 
+import ijson
+import pendulum
 import requests
 from airbyte_cdk import AirbyteLogger
+from airbyte_cdk.models import SyncMode
 from airbyte_cdk.sources import AbstractSource
 from airbyte_cdk.sources.streams import Stream
 from airbyte_cdk.sources.streams.http import HttpStream
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .auth import ShopifyAuthenticator
-from .transform import DataTypeEnforcer
+from .transform import DataTypeEnforcer, SchemaFieldsProjector
 from .utils import EagerlyCachedStreamState as stream_state_cache
 from .utils import ShopifyRateLimiter as limiter
 
+try:
+    # `orjson` decodes the GraphQL responses and the Bulk Operation results much faster, if it's available
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# The connection pool is shared between all streams, so the requests to the shop reuse the already opened connections,
+# instead of making the TCP + TLS handshake for each stream. `pool_maxsize` covers the concurrent child requests
+# (see `ChildSubstream.max_concurrency`) together with the parent stream ones, keep it in sync when raising the limit.
+# Only the connection errors are retried here, the `429` and `5xx` responses are left to the CDK backoff:
+# urllib3 fails on the `Retry-After: 2.0` header sent by Shopify, so the adapter doesn't read it.
+SHOPIFY_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=5, backoff_factor=0.5, respect_retry_after_header=False, raise_on_status=False),
+)
+
 
 class ShopifyStream(HttpStream, ABC):
 
@@ -29,47 +53,87 @@ class ShopifyStream(HttpStream, ABC):
     primary_key = "id"
     order_field = "updated_at"
     filter_field = "updated_at_min"
+    # the stream specific parameters of the first page request
+    default_params: Mapping[str, Any] = {}
+    # the schemas of the streams, loaded once per process, because the stream objects are created many times,
+    # for example, the child streams create the parent stream object to read the slices from.
+    cached_schemas: Dict[str, Mapping[str, Any]] = {}
 
     def __init__(self, config: Dict):
         super().__init__(authenticator=config["authenticator"])
-        self._transformer = DataTypeEnforcer(self.get_json_schema())
+        self._session.mount("https://", SHOPIFY_ADAPTER)
+        schema = self.get_json_schema()
+        self._transformer = DataTypeEnforcer(schema)
+        self._projector = SchemaFieldsProjector(schema)
         self.config = config
+        # the url_base and path are the same for each request, so we build them only once
+        self._url_base = f"https://{config['shop']}.myshopify.com/admin/api/{self.api_version}/"
+        self._path = f"{self.data_field}.json"
+        # the start_date is parsed once, to use it in the cursor values calculations
+        self._start_date = pendulum.parse(config["start_date"]) if config.get("start_date") else None
+        # the parameters of the first page request are the same for each stream slice, so we build them only once
+        self._base_params = {
+            "limit": self.limit,
+            "order": f"{self.order_field} asc",
+            self.filter_field: config.get("start_date"),
+            **self.default_params,
+        }
+
+    def get_json_schema(self) -> Mapping[str, Any]:
+        if self.name not in self.cached_schemas:
+            self.cached_schemas[self.name] = super().get_json_schema()
+        return self.cached_schemas[self.name]
 
     @property
     def url_base(self) -> str:
-        return f"https://{self.config['shop']}.myshopify.com/admin/api/{self.api_version}/"
+        return self._url_base
+
+    def path(self, **kwargs) -> str:
+        return self._path
 
     @staticmethod
     def next_page_token(response: requests.Response) -> Optional[Mapping[str, Any]]:
         next_page = response.links.get("next", None)
         if next_page:
-            return dict(parse_qsl(urlparse(next_page.get("url")).query))
+            # the `Link` url always has the same shape of query: `limit=250&page_info=...`, so we split it as is.
+            query = next_page.get("url").split("?", 1)[1]
+            return dict(param.split("=", 1) for param in query.split("&"))
         else:
             return None
 
     def request_params(self, next_page_token: Mapping[str, Any] = None, **kwargs) -> MutableMapping[str, Any]:
-        params = {"limit": self.limit}
         if next_page_token:
-            params.update(**next_page_token)
-        else:
-            params["order"] = f"{self.order_field} asc"
-            params[self.filter_field] = self.config["start_date"]
-        return params
+            return {"limit": self.limit, **next_page_token}
+        return self._base_params.copy()
+
+    @property
+    def records_path(self) -> str:
+        """The path to the records inside of the response, used to parse the records one by one while the response is downloaded"""
+        return f"{self.data_field}.item"
+
+    def request_kwargs(self, **kwargs) -> Mapping[str, Any]:
+        # the response body is parsed incrementally, see `parse_response`
+        return {"stream": True}
 
     @limiter.balance_rate_limit()
     def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
-        json_response = response.json()
-        records = json_response.get(self.data_field, []) if self.data_field is not None else json_response
+        if self.data_field is not None:
+            # decompress the `gzip` encoded body on the fly, while reading it
+            response.raw.decode_content = True
+            records = ijson.items(response.raw, self.records_path, use_float=True)
+        else:
+            records = response.json()
         # transform method was implemented according to issue 4841
         # Shopify API returns price fields as a string and it should be converted to number
         # this solution designed to convert string into number, but in future can be modified for general purpose
+        # the fields which are not declared in the schema are dropped before the transformation
         if isinstance(records, dict):
             # for cases when we have a single record as dict
-            yield self._transformer.transform(records)
+            yield self._transformer.transform(self._projector.project(records))
         else:
             # for other cases
             for record in records:
-                yield self._transformer.transform(record)
+                yield self._transformer.transform(self._projector.project(record))
 
     @property
     @abstractmethod
@@ -86,53 +150,239 @@ class IncrementalShopifyStream(ShopifyStream, ABC):
 
     # Setting the default cursor field for all streams
     cursor_field = "updated_at"
+    # The value of the cursor, if it's missing in the record or state
+    cursor_default: Any = ""
+
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        # The records updated while the previous sync was running could be missed by it, so they could be re-read
+        # with the overlap, if it's set. The re-read records are emitted again, only the `Incremental - Deduped History`
+        # sync mode removes these duplicates on the destination side.
+        self.cursor_overlap = pendulum.duration(minutes=config.get("cursor_overlap_minutes", 0))
 
     def get_updated_state(self, current_stream_state: MutableMapping[str, Any], latest_record: Mapping[str, Any]) -> Mapping[str, Any]:
-        return {self.cursor_field: max(latest_record.get(self.cursor_field, ""), current_stream_state.get(self.cursor_field, ""))}
+        # called for each record, so we compare the values directly, instead of calling `max()`
+        cursor_field = self.cursor_field
+        latest_value = latest_record.get(cursor_field, self.cursor_default)
+        current_value = current_stream_state.get(cursor_field, self.cursor_default)
+        return {cursor_field: latest_value if latest_value > current_value else current_value}
 
     @stream_state_cache.cache_stream_state
     def request_params(self, stream_state: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None, **kwargs):
         params = super().request_params(stream_state=stream_state, next_page_token=next_page_token, **kwargs)
         # If there is a next page token then we should only send pagination-related parameters.
-        if not next_page_token:
-            params["order"] = f"{self.order_field} asc"
-            if stream_state:
-                params[self.filter_field] = stream_state.get(self.cursor_field)
+        if not next_page_token and stream_state:
+            params[self.filter_field] = self.overlap_cursor_value(stream_state.get(self.cursor_field))
         return params
 
+    def overlap_cursor_value(self, cursor_value: Any) -> Any:
+        # the `id` cursors are not affected, the ids are assigned sequentially and the records don't change them on update.
+        if not self.cursor_overlap or not cursor_value or not isinstance(cursor_value, str):
+            return cursor_value
+        overlap_value = pendulum.parse(cursor_value) - self.cursor_overlap
+        # the overlap should not reach the records older than the start_date
+        if self._start_date and overlap_value < self._start_date:
+            overlap_value = self._start_date
+        return overlap_value.isoformat()
+
     # Parse the stream_slice with respect to stream_state for Incremental refresh
     # cases where we slice the stream, the endpoints for those classes don't accept any other filtering,
     # but they provide us with the updated_at field in most cases, so we used that as incremental filtering during the order slicing.
     def filter_records_newer_than_state(self, stream_state: Mapping[str, Any] = None, records_slice: Mapping[str, Any] = None) -> Iterable:
         # Getting records >= state
-        if stream_state:
-            for record in records_slice:
-                if record.get(self.cursor_field, "") >= stream_state.get(self.cursor_field):
-                    yield record
-        else:
+        cursor_field, cursor_default = self.cursor_field, self.cursor_default
+        state_value = stream_state.get(cursor_field) if stream_state else None
+        if state_value is None:
             yield from records_slice
+            return
+        # the child endpoints don't sort the records by the cursor field, so each record is compared with the state.
+        for record in records_slice:
+            if record.get(cursor_field, cursor_default) >= state_value:
+                yield record
 
 
-class Customers(IncrementalShopifyStream):
-    data_field = "customers"
+class ShopifyBulkOperationError(Exception):
+    """Shopify Bulk Operation was not completed"""
 
-    def path(self, **kwargs) -> str:
-        return f"{self.data_field}.json"
 
+class GraphQLBulkStream:
 
-class Orders(IncrementalShopifyStream):
-    data_field = "orders"
+    """
+    GraphQLBulkStream - replaces the REST pagination with the single GraphQL Bulk Operation, if `bulk` option is enabled.
+    The records are exported by Shopify into the JSONL file asynchronously, once it's ready - the file is downloaded
+    and parsed line by line, instead of making the API Call for each page of records.
+    More info: https://shopify.dev/api/usage/bulk-operations/queries
+
+    ::  @ bulk_query_object - the name of the GraphQL connection to export, for example: `orders`.
+    ::  @ bulk_query_fields - the mapping of the stream schema fields to the GraphQL fields of the node,
+          the schema field names are used as aliases, so the exported records have the same structure as REST ones.
+    ::  @ poll_interval - the time (sec) to hold between the checks of the Bulk Operation status.
+    ::  @ poll_timeout - the time (sec) to wait for the Bulk Operation to complete, before the sync is failed.
+    """
 
-    def path(self, **kwargs) -> str:
-        return f"{self.data_field}.json"
+    bulk_query_object: str = None
+    bulk_query_fields: Mapping[str, str] = {}
+    poll_interval: float = 1.0
+    poll_timeout: float = 6 * 60 * 60
+
+    bulk_run_mutation = """
+        mutation bulkOperationRunQuery($query: String!) {
+            bulkOperationRunQuery(query: $query) {
+                bulkOperation { id status }
+                userErrors { field message }
+            }
+        }
+    """
+    bulk_status_query = "{ currentBulkOperation { id status errorCode objectCount url } }"
+    shop_timezone_query = "{ shop { ianaTimezone } }"
+    bulk_failed_statuses = ("CANCELED", "CANCELING", "EXPIRED", "FAILED")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.use_bulk = self.config.get("bulk", False)
+        self._shop_timezone = None
+
+    @property
+    def graphql_url(self) -> str:
+        return f"{self.url_base}graphql.json"
+
+    def _graphql(self, query: str, variables: Mapping[str, Any] = None) -> Mapping[str, Any]:
+        response = self._session.post(self.graphql_url, json={"query": query, "variables": variables or {}})
+        response.raise_for_status()
+        json_response = json_loads(response.content)
+        if json_response.get("errors"):
+            raise ShopifyBulkOperationError(json_response["errors"])
+        return json_response["data"]
+
+    @property
+    def shop_timezone(self) -> str:
+        # REST API returns the datetime values in the shop timezone, while GraphQL ones are in UTC.
+        if not self._shop_timezone:
+            self._shop_timezone = self._graphql(self.shop_timezone_query)["shop"]["ianaTimezone"]
+        return self._shop_timezone
+
+    def bulk_query(self, stream_state: Mapping[str, Any] = None) -> str:
+        """
+        Builds the GraphQL query for the Bulk Operation, selecting only the fields defined in `bulk_query_fields`.
+        EXAMPLE:
+            { orders(query: "updated_at:>='2021-01-01'") { edges { node { id: legacyResourceId ... } } } }
+        """
+        filter_value = self.overlap_cursor_value(stream_state.get(self.cursor_field)) if stream_state else self.config["start_date"]
+        fields = {"id": "legacyResourceId", "admin_graphql_api_id": "id", **self.bulk_query_fields}
+        selection = " ".join(f"{alias}: {field}" for alias, field in fields.items())
+        query_filter = f"{self.cursor_field}:>='{filter_value}'"
+        return f'{{ {self.bulk_query_object}(query: "{query_filter}") {{ edges {{ node {{ {selection} }} }} }} }}'
+
+    def submit_bulk(self, query: str) -> Mapping[str, Any]:
+        result = self._graphql(self.bulk_run_mutation, variables={"query": query})["bulkOperationRunQuery"]
+        if result.get("userErrors"):
+            raise ShopifyBulkOperationError(result["userErrors"])
+        return result["bulkOperation"]
+
+    def poll_until_done(self, poll_interval: float = None) -> Optional[str]:
+        """
+        Checks the status of the current Bulk Operation until it's completed.
+        Returns the url of the JSONL file with the results, it's `None` when there are no records to export.
+        """
+        poll_interval = poll_interval if poll_interval is not None else self.poll_interval
+        deadline = monotonic() + self.poll_timeout
+        while True:
+            operation = self._graphql(self.bulk_status_query)["currentBulkOperation"]
+            if not operation:
+                raise ShopifyBulkOperationError("The submitted Bulk Operation is not found")
+            status = operation.get("status")
+            if status == "COMPLETED":
+                return operation.get("url")
+            elif status in self.bulk_failed_statuses:
+                raise ShopifyBulkOperationError(f"Bulk Operation {operation.get('id')} is {status}: {operation.get('errorCode')}")
+            elif monotonic() > deadline:
+                raise ShopifyBulkOperationError(f"Bulk Operation {operation.get('id')} is not completed in {self.poll_timeout} sec")
+            sleep(poll_interval)
+
+    @staticmethod
+    def download_jsonl(url: str) -> Iterable[Mapping[str, Any]]:
+        # the url is signed by Shopify and points to the external storage, so we don't pass the auth header there.
+        with requests.get(url, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json_loads(line)
+
+    def read_records(
+        self,
+        sync_mode: SyncMode = None,
+        stream_slice: Mapping[str, Any] = None,
+        stream_state: Mapping[str, Any] = None,
+        **kwargs,
+    ) -> Iterable[Mapping[str, Any]]:
+        if not self.use_bulk:
+            yield from super().read_records(sync_mode=sync_mode, stream_slice=stream_slice, stream_state=stream_state, **kwargs)
+            return
+
+        # the child streams read the parent records starting from the cached state,
+        # which is saved by `request_params` for the REST reads.
+        stream_state_cache.stream_state_to_tmp(self, stream_state=stream_state)
+        operation = self.submit_bulk(self.bulk_query(stream_state=stream_state))
+        self.logger.info(f"Reading {self.name} using Bulk Operation: {operation.get('id')}")
+        url = self.poll_until_done()
+        if url:
+            timezone = self.shop_timezone
+            datetime_fields = [field for field in self.bulk_query_fields if field.endswith("_at")]
+            for record in self.download_jsonl(url):
+                record["id"] = int(record["id"])
+                # convert the UTC values to the same format as REST API returns, so the state values are comparable.
+                for field in datetime_fields:
+                    if record.get(field):
+                        record[field] = pendulum.parse(record[field]).in_timezone(timezone).isoformat()
+                yield self._transformer.transform(record)
+
+    @property
+    def state_checkpoint_interval(self) -> Optional[int]:
+        # the records of Bulk Operation are not sorted by the cursor field,
+        # so the state is saved only once all the records are read.
+        return None if self.use_bulk else super().state_checkpoint_interval
 
-    def request_params(
-        self, stream_state: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None, **kwargs
-    ) -> MutableMapping[str, Any]:
-        params = super().request_params(stream_state=stream_state, next_page_token=next_page_token, **kwargs)
-        if not next_page_token:
-            params["status"] = "any"
-        return params
+
+class Customers(GraphQLBulkStream, IncrementalShopifyStream):
+    data_field = "customers"
+
+    bulk_query_object = "customers"
+    bulk_query_fields = {
+        "email": "email",
+        "phone": "phone",
+        "note": "note",
+        "first_name": "firstName",
+        "last_name": "lastName",
+        "verified_email": "verifiedEmail",
+        "accepts_marketing": "acceptsMarketing",
+        "tax_exempt": "taxExempt",
+        "created_at": "createdAt",
+        "updated_at": "updatedAt",
+    }
+
+
+class Orders(GraphQLBulkStream, IncrementalShopifyStream):
+    data_field = "orders"
+
+    bulk_query_object = "orders"
+    bulk_query_fields = {
+        "name": "name",
+        "email": "email",
+        "phone": "phone",
+        "note": "note",
+        "currency": "currencyCode",
+        "presentment_currency": "presentmentCurrencyCode",
+        "buyer_accepts_marketing": "customerAcceptsMarketing",
+        "taxes_included": "taxesIncluded",
+        "confirmed": "confirmed",
+        "test": "test",
+        "processed_at": "processedAt",
+        "closed_at": "closedAt",
+        "cancelled_at": "cancelledAt",
+        "created_at": "createdAt",
+        "updated_at": "updatedAt",
+    }
+    default_params = {"status": "any"}
 
 
 class ChildSubstream(IncrementalShopifyStream):
@@ -150,6 +400,10 @@ class ChildSubstream(IncrementalShopifyStream):
     ::  @ nested_record_field_name - the name of the field inside of nested_record.
     ::  @ nested_substream - the name of the nested entity inside of parent stream, helps to reduce the number of
           API Calls, if present, see `OrderRefunds` stream for more.
+    ::  @ filter_parent_by_state - skip the parent records, which were not updated since the child stream state,
+          should be enabled only if any change of the child record updates the parent record as well.
+    ::  @ cache_parent_records - keep the parent records read by the stream for the other child streams of the same
+          parent within the sync, should be enabled only if there are such streams, see `OrderRisks` for example.
     """
 
     parent_stream_class: object = None
@@ -157,6 +411,23 @@ class ChildSubstream(IncrementalShopifyStream):
     nested_record: str = "id"
     nested_record_field_name: str = None
     nested_substream = None
+    filter_parent_by_state: bool = False
+    cache_parent_records: bool = False
+    # the placeholder for the parent records, shared between the child streams within the sync
+    cached_parent_records: Dict[Tuple, List[Mapping[str, Any]]] = {}
+    # the upper bound of the `concurrency` option, matches the `maximum` declared in spec.json.
+    max_concurrency: int = 8
+
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        # the number of slices to fetch concurrently, `1` means the slices are read one by one.
+        self.concurrency = min(max(1, config.get("concurrency", 1)), self.max_concurrency)
+        self._prefetched_slices: Dict[int, Future] = {}
+
+    @property
+    def state_checkpoint_interval(self) -> int:
+        # the state is saved after each slice anyway, so there is no need to save it every page of the child records
+        return 2000
 
     def request_params(self, next_page_token: Mapping[str, Any] = None, **kwargs) -> MutableMapping[str, Any]:
         params = {"limit": self.limit}
@@ -165,6 +436,34 @@ class ChildSubstream(IncrementalShopifyStream):
         return params
 
     def stream_slices(self, stream_state: Mapping[str, Any] = None, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
+        """
+        Yielding the slices of the parent stream, while the records of the next `concurrency` slices are prefetched
+        in the background. The slices are yielded in the same order as they come from the parent stream,
+        so the state is checkpointed the same way as for sequential read.
+        """
+        slices = self.read_parent_slices(stream_state=stream_state, **kwargs)
+        if self.concurrency == 1:
+            yield from slices
+            return
+
+        def pop_prefetched() -> Mapping[str, Any]:
+            stream_slice, future = window.popleft()
+            self._prefetched_slices[id(stream_slice)] = future
+            return stream_slice
+
+        window = deque()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for stream_slice in slices:
+                window.append((stream_slice, executor.submit(self.read_slice, stream_slice, kwargs.get("sync_mode"))))
+                if len(window) == self.concurrency:
+                    yield pop_prefetched()
+            while window:
+                yield pop_prefetched()
+
+    def read_slice(self, stream_slice: Mapping[str, Any], sync_mode: SyncMode = None) -> List[Mapping[str, Any]]:
+        return list(super().read_records(sync_mode=sync_mode, stream_slice=stream_slice))
+
+    def read_parent_slices(self, stream_state: Mapping[str, Any] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
         """
         Reading the parent stream for slices with structure:
         EXAMPLE: for given nested_record as `id` of Orders,
@@ -172,16 +471,55 @@ class ChildSubstream(IncrementalShopifyStream):
         Output: [ {slice_key: 123}, {slice_key: 456}, ..., {slice_key: 999} ]
         """
         parent_stream = self.parent_stream_class(self.config)
+        if self.nested_substream or self.nested_record != "id":
+            # the nested entities are not exported by the Bulk Operation, so we read them using REST API.
+            parent_stream.use_bulk = False
+        # the child endpoints don't support any filtering, so to avoid the API Calls for the records we already have,
+        # we skip the parent records, which were not updated since the child stream state.
+        parent_filter_value = stream_state.get(self.cursor_field) if stream_state and self.filter_parent_by_state else None
+        if parent_filter_value:
+            # the parent and the child values could have the different utc offsets, so they are compared as datetimes.
+            parent_filter_value = pendulum.parse(parent_filter_value)
+        for record in self.read_parent_records(parent_stream, **kwargs):
+            parent_cursor_value = record.get(parent_stream.cursor_field)
+            if parent_filter_value and parent_cursor_value and pendulum.parse(parent_cursor_value) < parent_filter_value:
+                continue
+            yield {self.slice_key: record[self.nested_record]}
+
+    def read_parent_records(self, parent_stream: ShopifyStream, **kwargs) -> Iterable[Mapping[str, Any]]:
+        """
+        Reading the parent stream records, projected to the fields used for slicing.
+        The child streams of the same parent share the records within the sync, if `cache_parent_records` is set,
+        for example: `OrderRisks`, `Transactions` and `FulfillmentOrders` read the `Orders` only once.
+        """
         parent_stream_state = stream_state_cache.cached_state.get(parent_stream.name)
+        cache_key = (parent_stream.name, frozenset((parent_stream_state or {}).items()), self.nested_record, self.nested_substream)
+        if cache_key in self.cached_parent_records:
+            yield from self.cached_parent_records[cache_key]
+            return
+
+        nested_record, nested_record_field_name = self.nested_record, self.nested_record_field_name
+        parent_cursor_field = parent_stream.cursor_field if isinstance(parent_stream.cursor_field, str) else None
+        parent_records = []
         for record in parent_stream.read_records(stream_state=parent_stream_state, **kwargs):
             # to limit the number of API Calls and reduce the time of data fetch,
             # we can pull the ready data for child_substream, if nested data is present,
             # and corresponds to the data of child_substream we need.
-            if self.nested_substream:
-                if record.get(self.nested_substream):
-                    yield {self.slice_key: record[self.nested_record]}
-            else:
-                yield {self.slice_key: record[self.nested_record]}
+            if self.nested_substream and not record.get(self.nested_substream):
+                continue
+            nested_value = record[nested_record]
+            if nested_record_field_name and isinstance(nested_value, list):
+                # only the `nested_record_field_name` of the nested records is used to build the request
+                nested_value = [{nested_record_field_name: item.get(nested_record_field_name)} for item in nested_value]
+            parent_record = {nested_record: nested_value}
+            if parent_cursor_field:
+                parent_record[parent_cursor_field] = record.get(parent_cursor_field)
+            if self.cache_parent_records:
+                parent_records.append(parent_record)
+            yield parent_record
+        # cache only the fully read parent stream
+        if self.cache_parent_records:
+            self.cached_parent_records[cache_key] = parent_records
 
     def read_records(
         self,
@@ -198,53 +536,59 @@ class ChildSubstream(IncrementalShopifyStream):
             slice_data = slice_data[0].get(self.nested_record_field_name)
 
         self.logger.info(f"Reading {self.name} for {self.slice_key}: {slice_data}")
-        records = super().read_records(stream_slice=stream_slice, **kwargs)
+        prefetched = self._prefetched_slices.pop(id(stream_slice), None)
+        records = prefetched.result() if prefetched else super().read_records(stream_slice=stream_slice, **kwargs)
         yield from self.filter_records_newer_than_state(stream_state=stream_state, records_slice=records)
 
 
-class DraftOrders(IncrementalShopifyStream):
+class DraftOrders(GraphQLBulkStream, IncrementalShopifyStream):
     data_field = "draft_orders"
 
-    def path(self, **kwargs) -> str:
-        return f"{self.data_field}.json"
-
-
-class Products(IncrementalShopifyStream):
+    bulk_query_object = "draftOrders"
+    bulk_query_fields = {
+        "name": "name",
+        "email": "email",
+        "note": "note2",
+        "currency": "currencyCode",
+        "taxes_included": "taxesIncluded",
+        "tax_exempt": "taxExempt",
+        "invoice_url": "invoiceUrl",
+        "invoice_sent_at": "invoiceSentAt",
+        "completed_at": "completedAt",
+        "created_at": "createdAt",
+        "updated_at": "updatedAt",
+    }
+
+
+class Products(GraphQLBulkStream, IncrementalShopifyStream):
     data_field = "products"
 
-    def path(self, **kwargs) -> str:
-        return f"{self.data_field}.json"
+    bulk_query_object = "products"
+    bulk_query_fields = {
+        "title": "title",
+        "handle": "handle",
+        "vendor": "vendor",
+        "product_type": "productType",
+        "body_html": "descriptionHtml",
+        "template_suffix": "templateSuffix",
+        "published_at": "publishedAt",
+        "created_at": "createdAt",
+        "updated_at": "updatedAt",
+    }
 
 
 class AbandonedCheckouts(IncrementalShopifyStream):
     data_field = "checkouts"
-
-    def path(self, **kwargs) -> str:
-        return f"{self.data_field}.json"
-
-    def request_params(
-        self, stream_state: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None, **kwargs
-    ) -> MutableMapping[str, Any]:
-        params = super().request_params(stream_state=stream_state, next_page_token=next_page_token, **kwargs)
-        # If there is a next page token then we should only send pagination-related parameters.
-        if not next_page_token:
-            params["status"] = "any"
-        return params
+    default_params = {"status": "any"}
 
 
 class Metafields(IncrementalShopifyStream):
     data_field = "metafields"
 
-    def path(self, **kwargs) -> str:
-        return f"{self.data_field}.json"
-
 
 class CustomCollections(IncrementalShopifyStream):
     data_field = "custom_collections"
 
-    def path(self, **kwargs) -> str:
-        return f"{self.data_field}.json"
-
 
 class Collects(IncrementalShopifyStream):
 
@@ -260,23 +604,16 @@ class Collects(IncrementalShopifyStream):
 
     data_field = "collects"
     cursor_field = "id"
+    cursor_default = 0
     order_field = "id"
     filter_field = "since_id"
+    # all the collects are read on the first sync
+    default_params = {"since_id": 0}
 
-    def path(self, **kwargs) -> str:
-        return f"{self.data_field}.json"
-
-    def get_updated_state(self, current_stream_state: MutableMapping[str, Any], latest_record: Mapping[str, Any]) -> Mapping[str, Any]:
-        return {self.cursor_field: max(latest_record.get(self.cursor_field, 0), current_stream_state.get(self.cursor_field, 0))}
-
-    def request_params(
-        self, stream_state: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None, **kwargs
-    ) -> MutableMapping[str, Any]:
-        params = super().request_params(stream_state=stream_state, next_page_token=next_page_token, **kwargs)
-        # If there is a next page token then we should only send pagination-related parameters.
-        if not next_page_token and not stream_state:
-            params[self.filter_field] = 0
-        return params
+    @property
+    def state_checkpoint_interval(self) -> int:
+        # the collects are the small link records, so we save the state less often than every page
+        return 5000
 
 
 class OrderRefunds(ChildSubstream):
@@ -286,6 +623,8 @@ class OrderRefunds(ChildSubstream):
 
     data_field = "refunds"
     cursor_field = "created_at"
+    # the order is updated, once the refund is created
+    filter_parent_by_state = True
     # we pull out the records that we already know has the refunds data from Orders object
     nested_substream = "refunds"
 
@@ -298,25 +637,27 @@ class OrderRisks(ChildSubstream):
 
     parent_stream_class: object = Orders
     slice_key = "order_id"
+    cache_parent_records = True
 
     data_field = "risks"
     cursor_field = "id"
+    cursor_default = 0
 
     def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
         order_id = stream_slice["order_id"]
         return f"orders/{order_id}/{self.data_field}.json"
 
-    def get_updated_state(self, current_stream_state: MutableMapping[str, Any], latest_record: Mapping[str, Any]) -> Mapping[str, Any]:
-        return {self.cursor_field: max(latest_record.get(self.cursor_field, 0), current_stream_state.get(self.cursor_field, 0))}
-
 
 class Transactions(ChildSubstream):
 
     parent_stream_class: object = Orders
     slice_key = "order_id"
+    cache_parent_records = True
 
     data_field = "transactions"
     cursor_field = "created_at"
+    # the order is updated, once the transaction is created
+    filter_parent_by_state = True
 
     def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
         order_id = stream_slice["order_id"]
@@ -326,16 +667,10 @@ class Transactions(ChildSubstream):
 class Pages(IncrementalShopifyStream):
     data_field = "pages"
 
-    def path(self, **kwargs) -> str:
-        return f"{self.data_field}.json"
-
 
 class PriceRules(IncrementalShopifyStream):
     data_field = "price_rules"
 
-    def path(self, **kwargs) -> str:
-        return f"{self.data_field}.json"
-
 
 class DiscountCodes(ChildSubstream):
 
@@ -360,9 +695,6 @@ class Locations(ShopifyStream):
 
     data_field = "locations"
 
-    def path(self, **kwargs):
-        return f"{self.data_field}.json"
-
 
 class InventoryLevels(ChildSubstream):
     parent_stream_class: object = Locations
@@ -403,23 +735,23 @@ class FulfillmentOrders(ChildSubstream):
 
     parent_stream_class: object = Orders
     slice_key = "order_id"
+    cache_parent_records = True
 
     data_field = "fulfillment_orders"
 
     cursor_field = "id"
+    cursor_default = 0
 
     def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
         order_id = stream_slice[self.slice_key]
         return f"orders/{order_id}/{self.data_field}.json"
 
-    def get_updated_state(self, current_stream_state: MutableMapping[str, Any], latest_record: Mapping[str, Any]) -> Mapping[str, Any]:
-        return {self.cursor_field: max(latest_record.get(self.cursor_field, 0), current_stream_state.get(self.cursor_field, 0))}
-
 
 class Fulfillments(ChildSubstream):
 
     parent_stream_class: object = Orders
     slice_key = "order_id"
+    cache_parent_records = True
 
     data_field = "fulfillments"
 
@@ -431,8 +763,10 @@ class Fulfillments(ChildSubstream):
 class Shop(ShopifyStream):
     data_field = "shop"
 
-    def path(self, **kwargs) -> str:
-        return f"{self.data_field}.json"
+    @property
+    def records_path(self) -> str:
+        # the response holds the single record as dict
+        return self.data_field
 
 
 class SourceShopify(AbstractSource):
@@ -443,13 +777,14 @@ class SourceShopify(AbstractSource):
         """
         config["authenticator"] = ShopifyAuthenticator(config)
         try:
-            responce = list(Shop(config).read_records(sync_mode=None))
+            # the single shop record is enough to check the connection, so we don't wait for the whole response
+            shop = next(iter(Shop(config).read_records(sync_mode=None)), {})
             # check for the shop_id is present in the responce
-            shop_id = responce[0].get("id")
-            if shop_id is not None:
+            if shop.get("id") is not None:
                 return True, None
         except requests.exceptions.RequestException as e:
             return False, e
+        return False, f"Unable to read the shop info for {config['shop']}"
 
     def streams(self, config: Mapping[str, Any]) -> List[Stream]:
 
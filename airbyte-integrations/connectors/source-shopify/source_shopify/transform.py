@@ -3,7 +3,7 @@
 #
 
 from decimal import Decimal
-from typing import Any, Iterable, List, Mapping, MutableMapping
+from typing import Any, Iterable, List, Mapping, MutableMapping, Optional
 
 
 class DataTypeEnforcer:
@@ -105,3 +105,43 @@ class DataTypeEnforcer:
                 properties = schema.get("items", {})
                 return self._transform_array(field, properties)
         return field
+
+
+class SchemaFieldsProjector:
+    """
+    Shopify API returns some fields, which are not declared in the stream schema, for example: the `*_set` money fields.
+    Projector keeps only the fields declared in the schema, including the fields of nested objects and arrays of objects,
+    so the records don't hold the data, which is not going to be used.
+    The objects without the declared properties are kept as is.
+
+    Methods
+    -------
+    project(self, record: Any)
+        Accepts the record of Any type and returns it with the fields declared in the schema only
+    """
+
+    def __init__(self, schema: Mapping[str, Any], **kwargs):
+        super().__init__(**kwargs)
+        self._fields = self._fields_from_schema(schema)
+
+    @classmethod
+    def _fields_from_schema(cls, schema: Mapping[str, Any]) -> Optional[Mapping[str, Any]]:
+        # build the tree of the declared fields once, `None` means the value is kept as is
+        if "items" in schema:
+            return cls._fields_from_schema(schema["items"])
+        properties = schema.get("properties")
+        if not properties:
+            return None
+        return {field: cls._fields_from_schema(field_schema or {}) for field, field_schema in properties.items()}
+
+    def _project(self, value: Any, fields: Optional[Mapping[str, Any]]) -> Any:
+        if fields is None:
+            return value
+        if isinstance(value, dict):
+            return {field: self._project(value[field], nested_fields) for field, nested_fields in fields.items() if field in value}
+        if isinstance(value, list):
+            return [self._project(item, fields) for item in value]
+        return value
+
+    def project(self, record: Any) -> Any:
+        return self._project(record, self._fields)
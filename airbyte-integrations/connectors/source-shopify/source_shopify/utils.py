@@ -4,6 +4,7 @@
 
 
 from functools import wraps
+from threading import Lock
 from time import sleep
 from typing import Dict
 
@@ -25,6 +26,9 @@ class ShopifyRateLimiter:
     on_low_load: float = 0.2
     on_mid_load: float = 1.5
     on_high_load: float = 5.0
+    # the waits are shared by all the threads reading the child streams concurrently,
+    # so the concurrent requests are throttled by the same timings as the sequential ones.
+    wait_lock: Lock = Lock()
 
     @staticmethod
     def get_wait_time(*args, threshold: float = 0.9, rate_limit_header: str = "X-Shopify-Shop-Api-Call-Limit"):
@@ -81,9 +85,9 @@ class ShopifyRateLimiter:
         def decorator(func):
             @wraps(func)
             def wrapper_balance_rate_limit(*args, **kwargs):
-                ShopifyRateLimiter.wait_time(
-                    ShopifyRateLimiter.get_wait_time(*args, threshold=threshold, rate_limit_header=rate_limit_header)
-                )
+                wait_time = ShopifyRateLimiter.get_wait_time(*args, threshold=threshold, rate_limit_header=rate_limit_header)
+                with ShopifyRateLimiter.wait_lock:
+                    ShopifyRateLimiter.wait_time(wait_time)
                 return func(*args, **kwargs)
 
             return wrapper_balance_rate_limit
@@ -117,16 +121,17 @@ class EagerlyCachedStreamState:
         # change the mapping if needed
         stream: object = args[0]  # the self instance of the stream
         current_stream_state: Dict = kwargs["stream_state"] or {}
+        # the method is called for each request, so we look up the stream attributes only once
+        stream_name, cursor_field = stream.name, stream.cursor_field
         # get the current tmp_state_value
-        tmp_stream_state_value = state_object.get(stream.name, {}).get(stream.cursor_field, "")
+        tmp_stream_state_value = state_object.get(stream_name, {}).get(cursor_field, "")
         # Save the curent stream value for current sync, if present.
         if current_stream_state:
-            state_object[stream.name] = {stream.cursor_field: current_stream_state.get(stream.cursor_field, "")}
+            current_stream_state_value = current_stream_state.get(cursor_field, "")
             # Check if we have the saved state and keep the minimun value
             if tmp_stream_state_value:
-                state_object[stream.name] = {
-                    stream.cursor_field: min(current_stream_state.get(stream.cursor_field, ""), tmp_stream_state_value)
-                }
+                current_stream_state_value = min(current_stream_state_value, tmp_stream_state_value)
+            state_object[stream_name] = {cursor_field: current_stream_state_value}
         return state_object
 
     def cache_stream_state(func):
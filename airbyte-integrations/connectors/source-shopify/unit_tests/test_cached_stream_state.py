@@ -8,7 +8,7 @@ from source_shopify.source import Orders
 from source_shopify.utils import EagerlyCachedStreamState as stream_state_cache
 
 # Define the Stream class for the test
-STREAM = Orders(config={"authenticator": None})
+STREAM = Orders(config={"authenticator": None, "shop": "test_shop"})
 
 
 @pytest.mark.parametrize(
@@ -59,3 +59,14 @@ def test_incremental_sync(stream, cur_stream_state, state_object, expected_outpu
     args = [stream]
     actual = stream_state_cache.stream_state_to_tmp(*args, state_object=state_object, stream_state=cur_stream_state)
     assert actual == expected_output
+
+
+def test_keep_minimal_state_value():
+    """
+    When the stream state is updated during the sync, the tmp state keeps the minimal value of it.
+    """
+    args = [STREAM]
+    state_object = {STREAM.name: {STREAM.cursor_field: "2021-01-01T01-01-01"}}
+    cur_stream_state = {STREAM.cursor_field: "2021-01-05T02-02-02"}
+    actual = stream_state_cache.stream_state_to_tmp(*args, state_object=state_object, stream_state=cur_stream_state)
+    assert actual == {STREAM.name: {STREAM.cursor_field: "2021-01-01T01-01-01"}}
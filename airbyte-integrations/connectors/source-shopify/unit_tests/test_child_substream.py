@@ -0,0 +1,89 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import pytest
+from airbyte_cdk.models import SyncMode
+from source_shopify.source import ChildSubstream, InventoryItems, OrderRefunds, OrderRisks, Transactions
+from source_shopify.utils import ShopifyRateLimiter as limiter
+
+TEST_API_URL = "https://test_shop.myshopify.com/admin/api/2021-07"
+TEST_ORDER_IDS = [1, 2, 3, 4, 5]
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit_wait(monkeypatch):
+    monkeypatch.setattr(limiter, "wait_time", lambda wait_time: None)
+
+
+@pytest.fixture(autouse=True)
+def clear_parent_records_cache():
+    ChildSubstream.cached_parent_records.clear()
+
+
+@pytest.fixture
+def orders_with_risks(requests_mock):
+    requests_mock.get(f"{TEST_API_URL}/orders.json", json={"orders": [{"id": order_id} for order_id in TEST_ORDER_IDS]})
+    for order_id in TEST_ORDER_IDS:
+        requests_mock.get(f"{TEST_API_URL}/orders/{order_id}/risks.json", json={"risks": [{"id": order_id * 10, "order_id": order_id}]})
+
+
+@pytest.mark.parametrize("concurrency", [1, 3], ids=["sequential", "concurrent"])
+def test_read_slices_in_parent_order(orders_with_risks, concurrency):
+    config = {"authenticator": None, "shop": "test_shop", "start_date": "2021-01-01", "concurrency": concurrency}
+    stream = OrderRisks(config)
+
+    records = []
+    for stream_slice in stream.stream_slices(sync_mode=SyncMode.full_refresh, stream_state={}):
+        records.extend(stream.read_records(sync_mode=SyncMode.full_refresh, stream_slice=stream_slice))
+
+    assert [record["order_id"] for record in records] == TEST_ORDER_IDS
+    assert stream._prefetched_slices == {}
+
+
+@pytest.mark.parametrize(
+    "newer_updated_at, state_value",
+    [
+        ("2021-09-20T00:00:00-07:00", "2021-09-10T00:00:00-07:00"),
+        # 14:00 UTC is later than 13:00 UTC, while the strings compare the other way around
+        ("2021-09-19T14:00:00Z", "2021-09-19T15:00:00+02:00"),
+    ],
+    ids=["same_offset", "different_offset"],
+)
+def test_skip_parent_records_older_than_state(requests_mock, newer_updated_at, state_value):
+    orders = [
+        {"id": 1, "updated_at": "2021-09-01T00:00:00-07:00", "refunds": [{"id": 10}]},
+        {"id": 2, "updated_at": newer_updated_at, "refunds": [{"id": 20}]},
+    ]
+    requests_mock.get(f"{TEST_API_URL}/orders.json", json={"orders": orders})
+    config = {"authenticator": None, "shop": "test_shop", "start_date": "2021-01-01"}
+    stream = OrderRefunds(config)
+
+    stream_state = {stream.cursor_field: state_value}
+    actual = list(stream.stream_slices(sync_mode=SyncMode.incremental, stream_state=stream_state))
+
+    assert actual == [{"order_id": 2}]
+
+
+def test_parent_records_shared_between_child_streams(orders_with_risks, requests_mock):
+    config = {"authenticator": None, "shop": "test_shop", "start_date": "2021-01-01"}
+
+    risks_slices = list(OrderRisks(config).stream_slices(sync_mode=SyncMode.full_refresh, stream_state={}))
+    transactions_slices = list(Transactions(config).stream_slices(sync_mode=SyncMode.full_refresh, stream_state={}))
+
+    assert risks_slices == transactions_slices == [{"order_id": order_id} for order_id in TEST_ORDER_IDS]
+    orders_requests = [request for request in requests_mock.request_history if request.path.endswith("/orders.json")]
+    assert len(orders_requests) == 1
+
+
+def test_parent_records_projected_to_nested_field(requests_mock):
+    products = [{"id": 1, "variants": [{"id": 10, "sku": "sku-10", "price": "1.00", "inventory_item_id": 100}]}]
+    requests_mock.get(f"{TEST_API_URL}/products.json", json={"products": products})
+    config = {"authenticator": None, "shop": "test_shop", "start_date": "2021-01-01"}
+
+    actual = list(InventoryItems(config).stream_slices(sync_mode=SyncMode.full_refresh, stream_state={}))
+
+    assert actual == [{"id": [{"inventory_item_id": 100}]}]
+    # no other child stream reads the `variants` of `Products`, so they are not kept
+    assert ChildSubstream.cached_parent_records == {}
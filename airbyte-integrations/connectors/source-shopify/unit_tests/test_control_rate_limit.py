@@ -3,7 +3,12 @@
 #
 
 
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+import pytest
 import requests
+from source_shopify.source import SHOPIFY_ADAPTER
 from source_shopify.utils import ShopifyRateLimiter as limiter
 
 TEST_DATA_FIELD = "some_data_field"
@@ -69,3 +74,54 @@ def test_with_high_load(requests_mock):
     actual_sleep_time = limiter.get_wait_time(test_response, threshold=TEST_THRESHOLD, rate_limit_header=TEST_RATE_LIMIT_HEADER)
 
     assert limiter.on_high_load == actual_sleep_time
+
+
+def test_wait_is_shared_between_threads(monkeypatch):
+    """
+    Test checks the wait is made holding the shared lock,
+    so the concurrent child stream reads hold one after another, instead of calling the API at the same time.
+    """
+    waits = []
+    monkeypatch.setattr(limiter, "wait_time", lambda wait_time: waits.append(limiter.wait_lock.locked()))
+
+    @limiter.balance_rate_limit(threshold=TEST_THRESHOLD, rate_limit_header=TEST_RATE_LIMIT_HEADER)
+    def parse_response(response):
+        return response
+
+    parse_response(None)
+
+    assert waits == [True]
+
+
+class RateLimitedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        # Shopify sends the `Retry-After` value with the fraction part
+        self.send_response(429)
+        self.send_header("Retry-After", "2.0")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def rate_limited_server():
+    server = HTTPServer(("127.0.0.1", 0), RateLimitedHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_adapter_returns_rate_limited_response(rate_limited_server):
+    """
+    Test checks the shared adapter passes the 429 response to the CDK, which backs off and retries it,
+    instead of failing on the `Retry-After: 2.0` header.
+    """
+    session = requests.Session()
+    session.mount("http://", SHOPIFY_ADAPTER)
+
+    response = session.get(rate_limited_server)
+
+    assert response.status_code == 429
@@ -0,0 +1,99 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import json
+
+import pytest
+from source_shopify.source import Orders, ShopifyBulkOperationError
+from source_shopify.utils import EagerlyCachedStreamState as stream_state_cache
+
+TEST_CONFIG = {"authenticator": None, "shop": "test_shop", "start_date": "2021-01-01", "bulk": True}
+TEST_GRAPHQL_URL = "https://test_shop.myshopify.com/admin/api/2021-07/graphql.json"
+TEST_RESULT_URL = "https://storage.googleapis.com/shopify/bulk-result.jsonl"
+TEST_BULK_OPERATION = {"id": "gid://shopify/BulkOperation/1", "status": "CREATED"}
+
+
+def bulk_status(status, url=None):
+    return {"json": {"data": {"currentBulkOperation": {**TEST_BULK_OPERATION, "status": status, "errorCode": None, "url": url}}}}
+
+
+def test_bulk_query_uses_stream_state():
+    stream = Orders(config=TEST_CONFIG)
+    query = stream.bulk_query(stream_state={"updated_at": "2021-09-19T09:08:24-07:00"})
+    assert query.startswith("{ orders(query: \"updated_at:>='2021-09-19T09:08:24-07:00'\")")
+    assert "id: legacyResourceId admin_graphql_api_id: id" in query
+    assert "updated_at: updatedAt" in query
+
+
+def test_read_records_from_bulk_operation(requests_mock):
+    records = [
+        {"id": "1", "admin_graphql_api_id": "gid://shopify/Order/1", "updated_at": "2021-09-19T16:08:24Z"},
+        {"id": "2", "admin_graphql_api_id": "gid://shopify/Order/2", "updated_at": "2021-09-20T16:08:24Z"},
+    ]
+    requests_mock.post(
+        TEST_GRAPHQL_URL,
+        [
+            {"json": {"data": {"bulkOperationRunQuery": {"bulkOperation": TEST_BULK_OPERATION, "userErrors": []}}}},
+            bulk_status("RUNNING"),
+            bulk_status("COMPLETED", url=TEST_RESULT_URL),
+            {"json": {"data": {"shop": {"ianaTimezone": "America/Los_Angeles"}}}},
+        ],
+    )
+    requests_mock.get(TEST_RESULT_URL, text="\n".join(json.dumps(record) for record in records))
+
+    stream = Orders(config=TEST_CONFIG)
+    stream.poll_interval = 0
+    actual = list(stream.read_records(stream_state={}))
+
+    assert [record["id"] for record in actual] == [1, 2]
+    # the datetime values are converted to the shop timezone, as the REST API returns them.
+    assert [record["updated_at"] for record in actual] == ["2021-09-19T09:08:24-07:00", "2021-09-20T09:08:24-07:00"]
+    assert stream.state_checkpoint_interval is None
+
+
+def test_bulk_read_caches_stream_state(requests_mock, monkeypatch):
+    monkeypatch.delitem(stream_state_cache.cached_state, "orders", raising=False)
+    requests_mock.post(
+        TEST_GRAPHQL_URL,
+        [
+            {"json": {"data": {"bulkOperationRunQuery": {"bulkOperation": TEST_BULK_OPERATION, "userErrors": []}}}},
+            bulk_status("COMPLETED"),
+        ],
+    )
+    stream = Orders(config=TEST_CONFIG)
+    stream_state = {"updated_at": "2021-09-19T09:08:24-07:00"}
+    list(stream.read_records(stream_state=stream_state))
+
+    # the child streams of `Orders` read it with this state
+    assert stream_state_cache.cached_state["orders"] == stream_state
+
+
+def test_bulk_operation_failed(requests_mock):
+    requests_mock.post(
+        TEST_GRAPHQL_URL,
+        [
+            {"json": {"data": {"bulkOperationRunQuery": {"bulkOperation": TEST_BULK_OPERATION, "userErrors": []}}}},
+            bulk_status("FAILED"),
+        ],
+    )
+    stream = Orders(config=TEST_CONFIG)
+    with pytest.raises(ShopifyBulkOperationError):
+        list(stream.read_records(stream_state={}))
+
+
+@pytest.mark.parametrize(
+    "operation_status, poll_timeout",
+    [
+        ({"json": {"data": {"currentBulkOperation": None}}}, 60),
+        (bulk_status("RUNNING"), -1),
+    ],
+    ids=["operation_not_found", "timeout"],
+)
+def test_poll_bulk_operation_fails(requests_mock, operation_status, poll_timeout):
+    requests_mock.post(TEST_GRAPHQL_URL, [operation_status])
+    stream = Orders(config=TEST_CONFIG)
+    stream.poll_timeout = poll_timeout
+    with pytest.raises(ShopifyBulkOperationError):
+        stream.poll_until_done(poll_interval=0)
@@ -5,7 +5,7 @@
 from decimal import Decimal
 
 import pytest
-from source_shopify.transform import DataTypeEnforcer
+from source_shopify.transform import DataTypeEnforcer, SchemaFieldsProjector
 
 
 def find_by_path(path_list, value):
@@ -255,3 +255,36 @@ def test_enforcer_nested_array(transform_object, schema, checks):
 )
 def test_enforcer_string_to_number_in_array(transform_object, schema, checks):
     run_check(transform_object, schema, checks)
+
+
+@pytest.mark.parametrize(
+    "record, schema, expected",
+    [
+        (
+            {"id": 1, "admin_graphql_api_id": "gid://shopify/Order/1", "total_price_set": {"shop_money": {"amount": "1.00"}}},
+            {"type": "object", "properties": {"id": {"type": ["null", "integer"]}, "admin_graphql_api_id": {"type": ["null", "string"]}}},
+            {"id": 1, "admin_graphql_api_id": "gid://shopify/Order/1"},
+        ),
+        (
+            {"line_items": [{"id": 1, "price_set": {}}, {"id": 2, "price_set": {}}]},
+            {
+                "type": "object",
+                "properties": {
+                    "line_items": {
+                        "type": ["null", "array"],
+                        "items": {"type": ["null", "object"], "properties": {"id": {"type": ["null", "integer"]}}},
+                    },
+                },
+            },
+            {"line_items": [{"id": 1}, {"id": 2}]},
+        ),
+        (
+            {"note_attributes": {"any": "value"}},
+            {"type": "object", "properties": {"note_attributes": {"type": ["null", "object"]}}},
+            {"note_attributes": {"any": "value"}},
+        ),
+    ],
+    ids=["top level fields", "array of objects", "object without properties"],
+)
+def test_projector_keeps_schema_fields(record, schema, expected):
+    assert SchemaFieldsProjector(schema).project(record) == expected
@@ -2,8 +2,14 @@
 # Copyright (c) 2021 Airbyte, Inc., all rights reserved.
 #
 
+import gzip
+import json
+
+import ijson
+import pytest
 import requests
-from source_shopify.source import ShopifyStream
+from source_shopify.source import Collects, InventoryItems, OrderRefunds, OrderRisks, Orders, ShopifyStream, SourceShopify
+from source_shopify.utils import ShopifyRateLimiter as limiter
 
 
 def test_get_next_page_token(requests_mock):
@@ -25,3 +31,119 @@ def test_get_next_page_token(requests_mock):
 
     test = ShopifyStream.next_page_token(response)
     assert test == expected_output_token
+
+
+@pytest.mark.parametrize(
+    "stream_class, cursor_overlap_minutes, stream_state, expected_filter",
+    [
+        (Orders, 0, {"updated_at": "2021-09-19T09:08:24-07:00"}, ("updated_at_min", "2021-09-19T09:08:24-07:00")),
+        (Orders, 15, {"updated_at": "2021-09-19T09:08:24-07:00"}, ("updated_at_min", "2021-09-19T08:53:24-07:00")),
+        (Orders, 15, {"updated_at": "2021-01-01T00:05:00+00:00"}, ("updated_at_min", "2021-01-01T00:00:00+00:00")),
+        (Collects, 15, {"id": 29427031703741}, ("since_id", 29427031703741)),
+    ],
+    ids=["no overlap", "datetime cursor", "overlap limited by start_date", "id cursor"],
+)
+def test_request_params_with_cursor_overlap(stream_class, cursor_overlap_minutes, stream_state, expected_filter):
+    config = {"authenticator": None, "shop": "test_shop", "start_date": "2021-01-01", "cursor_overlap_minutes": cursor_overlap_minutes}
+    stream = stream_class(config=config)
+    filter_field, filter_value = expected_filter
+    assert stream.request_params(stream_state=stream_state)[filter_field] == filter_value
+
+
+@pytest.mark.parametrize(
+    "stream_class, stream_state, records, expected",
+    [
+        (
+            OrderRefunds,
+            {"created_at": "2021-09-09T02:57:43-07:00"},
+            [{"created_at": "2021-09-01T00:00:00-07:00"}, {"created_at": "2021-09-10T00:00:00-07:00"}],
+            [{"created_at": "2021-09-10T00:00:00-07:00"}],
+        ),
+        (
+            InventoryItems,
+            {"updated_at": "2021-09-10T00:00:00-07:00"},
+            [
+                {"updated_at": "2021-09-01T00:00:00-07:00"},
+                {"updated_at": "2021-09-12T00:00:00-07:00"},
+                {"updated_at": "2021-08-01T00:00:00-07:00"},
+            ],
+            [{"updated_at": "2021-09-12T00:00:00-07:00"}],
+        ),
+        (OrderRisks, {"id": 20}, [{"id": 10}, {"id": 20}, {"id": 30}], [{"id": 20}, {"id": 30}]),
+        (OrderRisks, {}, [{"id": 10}, {"id": 20}], [{"id": 10}, {"id": 20}]),
+        (OrderRisks, {"created_at": "2021-09-09T02:57:43-07:00"}, [{"id": 10}], [{"id": 10}]),
+    ],
+    ids=["datetime cursor", "unsorted records", "id cursor", "no state", "no cursor in state"],
+)
+def test_filter_records_newer_than_state(stream_class, stream_state, records, expected):
+    stream = stream_class(config={"authenticator": None, "shop": "test_shop"})
+    assert list(stream.filter_records_newer_than_state(stream_state=stream_state, records_slice=iter(records))) == expected
+
+
+@pytest.mark.parametrize(
+    "shop_response, expected",
+    [({"shop": {"id": 1, "name": "test_shop"}}, True), ({"shop": {}}, False)],
+    ids=["valid shop", "empty shop"],
+)
+def test_check_connection(requests_mock, monkeypatch, shop_response, expected):
+    monkeypatch.setattr(limiter, "wait_time", lambda wait_time: None)
+    config = {"shop": "test_shop", "start_date": "2021-01-01", "auth_method": {"auth_method": "api_password", "api_password": "test"}}
+    requests_mock.get("https://test_shop.myshopify.com/admin/api/2021-07/shop.json", json=shop_response)
+    status, _ = SourceShopify().check_connection(logger=None, config=config)
+    assert status is expected
+
+
+@pytest.mark.parametrize(
+    "stream_class, expected_params",
+    [
+        (Orders, {"limit": 250, "order": "updated_at asc", "updated_at_min": "2021-01-01", "status": "any"}),
+        (Collects, {"limit": 250, "order": "id asc", "since_id": 0}),
+    ],
+    ids=["Orders", "Collects"],
+)
+def test_first_page_request_params(stream_class, expected_params):
+    stream = stream_class(config={"authenticator": None, "shop": "test_shop", "start_date": "2021-01-01"})
+    stream.request_params(stream_state={})["limit"] = 1
+    assert stream.request_params(stream_state={}) == expected_params
+    assert stream.request_params(stream_state={}, next_page_token={"page_info": "next"}) == {"limit": 250, "page_info": "next"}
+
+
+def test_parse_gzip_encoded_response(requests_mock):
+    """
+    Test shows that the `gzip` encoded pages are decompressed on the fly, while the records are parsed from the response.
+    """
+    records = [{"id": 1, "updated_at": "2021-09-19T09:08:24-07:00"}, {"id": 2, "updated_at": "2021-09-20T09:08:24-07:00"}]
+    body = gzip.compress(json.dumps({"orders": records}).encode())
+    requests_mock.get("https://test.myshopify.com/", content=body, headers={"Content-Encoding": "gzip"})
+    response = requests.get("https://test.myshopify.com/", stream=True)
+
+    stream = Orders(config={"authenticator": None, "shop": "test_shop"})
+    assert list(stream.parse_response.__wrapped__(stream, response)) == records
+
+
+def test_ijson_uses_c_backend():
+    """
+    Test shows that the installed `ijson` parses the pages with the C extension,
+    the pure python backend is slower than decoding the whole page with `json`.
+    """
+    assert ijson.backend == "yajl2_c"
+
+
+@pytest.mark.parametrize(
+    "stream_class, current_stream_state, latest_record, expected",
+    [
+        (Orders, {}, {"updated_at": "2021-09-19T09:08:24-07:00"}, {"updated_at": "2021-09-19T09:08:24-07:00"}),
+        (
+            Orders,
+            {"updated_at": "2021-09-20T09:08:24-07:00"},
+            {"updated_at": "2021-09-19T09:08:24-07:00"},
+            {"updated_at": "2021-09-20T09:08:24-07:00"},
+        ),
+        (Collects, {"id": 20}, {"id": 30}, {"id": 30}),
+        (OrderRisks, {"id": 20}, {}, {"id": 20}),
+    ],
+    ids=["empty state", "older record", "id cursor", "id cursor missing in record"],
+)
+def test_get_updated_state(stream_class, current_stream_state, latest_record, expected):
+    stream = stream_class(config={"authenticator": None, "shop": "test_shop"})
+    assert stream.get_updated_state(current_stream_state, latest_record) == expected